@@ -1,4 +1,6 @@
-from machine import Pin, PWM
+from machine import Pin, PWM, mem32
+import micropython
+import sys
 import utime
 
 # ========= USER SETTINGS =========
@@ -9,24 +11,67 @@ MAX_US    = 2000     # 100% throttle (typical)
 HOLD_S    = 5        # hold at each 10% step
 SAFE_OUT  = 15       # drives HIGH
 SAFE_IN   = 16       # must read HIGH via the jumper to be "safe"
-CHECK_MS  = 50       # safety check period during holds
+CHECK_MS  = 50       # wake period during holds (the safety IRQ cuts throttle itself)
 # =================================
 
 # --- PWM setup ---
 p = PWM(Pin(ESC_PIN))
 p.freq(F_HZ)
+p.duty_u16(0)   # firmware only enables the slice once a duty has been set
 PERIOD_US = 1_000_000 // F_HZ  # e.g., 20,000 µs at 50 Hz
 
+# --- Direct PWM compare-register access (RP2040 only) ---
+# Throttle updates store straight into the slice's CC register instead of
+# going through PWM.duty_u16. CC counts against the slice's TOP (chosen by
+# p.freq()), so the µs scale is derived from TOP rather than 65535.
+# The register map below is RP2040-specific; other boards (e.g. RP2350)
+# fall back to PWM.duty_u16.
+DIRECT_CC = "RP2040" in sys.implementation._machine
+if DIRECT_CC:
+    PWM_BASE  = 0x40050000
+    _SLICE    = (ESC_PIN >> 1) & 7
+    _SLICE_BASE = PWM_BASE + _SLICE * 0x14       # CSR, DIV, CTR, CC, TOP
+    _CC_ADDR  = _SLICE_BASE + 0x0C
+    _CC_SHIFT = 16 if ESC_PIN & 1 else 0         # channel B = high half
+    _PWM_FULL = (mem32[_SLICE_BASE + 0x10] & 0xFFFF) + 1   # TOP + 1
+else:
+    _PWM_FULL = 65535                            # duty_u16 full scale
+
+# PWM units per µs in Q8 fixed point (multiply + shift, no divide); kept in
+# small-int range since us * scale < 2**30 for any pulse within the period.
+_PWM_PER_US_Q8 = (_PWM_FULL * 256 + PERIOD_US // 2) // PERIOD_US
+
+@micropython.viper
+def _cc_store(d: int):
+    # Native 32-bit read-modify-write of our half of CC. No int objects are
+    # created (unlike mem32 with values >= 2**30), so it is hard-IRQ safe.
+    cc = ptr32(_CC_ADDR)
+    shift = int(_CC_SHIFT)
+    cc[0] = (cc[0] & (0xFFFF << (16 - shift))) | (d << shift)
+
+# Bound once, so the hard IRQ can call it without allocating
+_pwm_store = _cc_store if DIRECT_CC else p.duty_u16
+
 def set_pulse_us(us: int):
     if us < 0: us = 0
-    duty = int(us * 65535 // PERIOD_US)
-    p.duty_u16(duty)
+    _pwm_store((us * _PWM_PER_US_Q8) >> 8)
+
+# Pulse width and PWM value for every whole percent 0..100, built once with
+# the exact mapping (any MIN_US..MAX_US span): set_percent is a lookup
+_US_LUT = tuple(MIN_US + (MAX_US - MIN_US) * percent // 100 for percent in range(101))
+_PWM_LUT = tuple((us * _PWM_PER_US_Q8) >> 8 for us in _US_LUT)
 
 def set_percent(percent: int):
     if percent < 0:   percent = 0
     if percent > 100: percent = 100
-    us = MIN_US + (MAX_US - MIN_US) * percent // 100
-    set_pulse_us(us)
+    # Never undo the safety IRQ's cut: refuse throttle while it is latched
+    if percent and _unsafe:
+        raise RuntimeError("Safety interlock BROKEN during run. Cutting throttle.")
+    _pwm_store(_PWM_LUT[percent])
+    if percent and _unsafe:   # IRQ fired between the check and the write
+        _pwm_store(_PWM_LUT[0])
+        raise RuntimeError("Safety interlock BROKEN during run. Cutting throttle.")
+    us = _US_LUT[percent]   # for the log line / return value
     print(f"Throttle: {percent:>3}%  |  {us} µs")
     return us
 
@@ -38,30 +83,50 @@ def safety_ok() -> bool:
     """Return True when the jumper is detected (GP16==1)."""
     return safe_sns.value() == 1
 
+# Set by the IRQ on a falling edge of GP16; cleared only once safety is restored.
+# The flag latches, so contact bounce just re-cuts throttle (no debounce needed).
+_unsafe = False
+
+def _on_unsafe(pin):
+    """Hard IRQ: cut throttle the moment the jumper breaks (no polling lag)."""
+    global _unsafe
+    _pwm_store(_PWM_LUT[0])
+    _unsafe = True
+
+safe_sns.irq(trigger=Pin.IRQ_FALLING, handler=_on_unsafe, hard=True)
+
 def require_safety_stable(ms=200):
     """Ensure safety line reads HIGH consistently for ~ms before proceeding."""
-    t0 = utime.ticks_ms()
-    while utime.ticks_diff(utime.ticks_ms(), t0) < ms:
-        if not safety_ok():
-            raise RuntimeError("Safety interlock NOT present. Connect GP15 to GP16.")
-        utime.sleep_ms(5)
+    global _unsafe
+    _unsafe = not safety_ok()
+    utime.sleep_ms(ms)
+    if _unsafe or not safety_ok():
+        raise RuntimeError("Safety interlock NOT present. Connect GP15 to GP16.")
 
 def hold_with_safety(seconds: int):
-    """Hold current throttle, but poll safety. Abort if broken."""
-    end_ms = utime.ticks_add(utime.ticks_ms(), seconds * 1000)
-    while utime.ticks_diff(end_ms, utime.ticks_ms()) > 0:
-        if not safety_ok():
-            raise RuntimeError("Safety interlock BROKEN during run. Cutting throttle.")
-        utime.sleep_ms(CHECK_MS)
+    """Hold current throttle until the time is up or the safety IRQ trips."""
+    # Bind to locals: one LOAD_FAST per call instead of two attribute lookups
+    ticks_ms = utime.ticks_ms
+    ticks_diff = utime.ticks_diff
+    sleep_ms = utime.sleep_ms
+    end_ms = utime.ticks_add(ticks_ms(), seconds * 1000)
+    while not _unsafe and ticks_diff(end_ms, ticks_ms()) > 0:
+        sleep_ms(CHECK_MS)
+    if _unsafe:
+        raise RuntimeError("Safety interlock BROKEN during run. Cutting throttle.")
 
 def kill_and_wait(msg="Throttle KILLED (safety)."):
+    global _unsafe
     print(msg)
     set_percent(0)
     # Keep PWM at 0% (many ESCs expect a continuous signal).
     # Block here until safety is restored (optional behavior).
     print("Waiting for safety to be restored (GP15↔GP16 connected)...")
-    while not safety_ok():
-        utime.sleep_ms(100)
+    _safety_ok = safety_ok
+    sleep_ms = utime.sleep_ms
+    while not _safety_ok():
+        sleep_ms(100)
+    _unsafe = False
     print("Safety restored. Staying at 0%.")
 
 try:
@@ -2,14 +2,22 @@
 # Reads ELRS/CRSF RC channels (type 0x16) over UART and prints normalized values.
 
 from machine import UART, Pin
+import array
+import micropython
 import time
 
+try:
+    import crsf as _crsf    # native decoder (usermod/crsf), if built into the firmware
+except ImportError:
+    _crsf = None
+
 # ----- USER CONFIG -----
 UART_ID   = 0         # 0 or 1
 PIN_RX    = 1         # UART0 RX=GP1 (change to 5 if using UART1)
 PIN_TX    = 0         # UART0 TX=GP0 (optional; needed only for telemetry)
 BAUD      = 420000    # try 416666 if your setup prefers it
 TIMEOUT   = 50        # ms UART timeout
+RXBUF     = 1024      # driver RX buffer (~24 ms at 420 kbaud), filled from a hardware IRQ
 
 # ----- CRSF CONSTANTS -----
 CRSF_SYNC = 0xC8
@@ -17,99 +25,319 @@ TYPE_RC_CHANNELS = 0x16
 MAX_FRAME = 64
 
 # CRC8 (poly 0xD5), init=0, over [type..payload]
-def crc8_d5(buf):
+# Table-driven: one lookup per byte instead of 8 shift/xor rounds.
+def _crc8_d5_byte(crc):
     poly = 0xD5
-    crc = 0x00
-    for b in buf:
-        crc ^= b
-        for _ in range(8):
-            if (crc & 0x80):
-                crc = ((crc << 1) ^ poly) & 0xFF
-            else:
-                crc = (crc << 1) & 0xFF
+    for _ in range(8):
+        if (crc & 0x80):
+            crc = ((crc << 1) ^ poly) & 0xFF
+        else:
+            crc = (crc << 1) & 0xFF
+    return crc
+
+_CRC_TBL = bytes(_crc8_d5_byte(i) for i in range(256))
+
+# Viper: native code with typed pointer indexing. Pass crc=0 for a plain
+# CRC, or a running value to continue one.
+@micropython.viper
+def crc8_d5(buf, crc: int) -> int:
+    tbl = ptr8(_CRC_TBL)
+    p = ptr8(buf)
+    n = int(len(buf))
+    i = 0
+    while i < n:
+        crc = int(tbl[crc ^ int(p[i])])
+        i += 1
     return crc
 
 # Convert CRSF ticks <-> microseconds and to [-1, 1]
 def ticks_to_us(t):     # per CRSF spec
     return int((t - 992) * 5 / 8 + 1500)
 
+# ticks -> us is *5/8, us -> unit is /500; fused into one multiply
+_UNIT_PER_TICK = 5.0 / (8.0 * 500.0)   # 0.00125
+
 def ticks_to_unit(t):   # map 1000..2000us to ~ -1..+1 using 1500 center
-    us = ticks_to_us(t)
-    return max(-1.0, min(1.0, (us - 1500) / 500.0))
+    v = (t - 992) * _UNIT_PER_TICK
+    return -1.0 if v < -1.0 else 1.0 if v > 1.0 else v
+
+def ticks_to_q15(t):    # same mapping as ticks_to_unit, as int -32768..32767
+    q = (t - 992) * 1024 // 25         # 32768 * 0.00125 == 40.96 == 1024/25
+    return -32768 if q < -32768 else 32767 if q > 32767 else q
 
 # Unpack 16 x 11-bit channels from 22 payload bytes
-def unpack_16ch_11bit(payload22):
+# (22 bytes == 176 bits == exactly 16 channels, LSB-first).
+# Viper has no bigint, so shift bytes through a small 32-bit accumulator.
+@micropython.viper
+def _unpack_into(payload22, out):
+    p = ptr8(payload22)
+    o = ptr16(out)
+    acc = 0
     bits = 0
-    bitbuf = 0
-    out = []
-    for b in payload22:
-        bitbuf |= (b << bits)
-        bits += 8
-        while bits >= 11 and len(out) < 16:
-            out.append(bitbuf & 0x7FF)
-            bitbuf >>= 11
-            bits -= 11
-    # Ensure 16 entries
-    while len(out) < 16:
-        out.append(992)  # neutral
-    return out[:16]
+    i = 0
+    ch = 0
+    while ch < 16:
+        while bits < 11:
+            acc |= int(p[i]) << bits
+            i += 1
+            bits += 8
+        o[ch] = acc & 0x7FF
+        acc >>= 11
+        bits -= 11
+        ch += 1
+
+# Filled in place every frame (no per-frame allocation). Callers get this
+# same array back, so copy it if a value must outlive the next frame.
+_channels = array.array('H', [992] * 16)
+
+def unpack_16ch_11bit(payload22):
+    _unpack_into(payload22, _channels)
+    return _channels
 
 # ----- UART SETUP -----
-uart = UART(UART_ID, baudrate=BAUD, bits=8, parity=None, stop=1, tx=Pin(PIN_TX), rx=Pin(PIN_RX), timeout=TIMEOUT)
+uart = UART(UART_ID, baudrate=BAUD, bits=8, parity=None, stop=1, tx=Pin(PIN_TX), rx=Pin(PIN_RX), timeout=TIMEOUT, rxbuf=RXBUF)
+_uart_any = uart.any            # bound once: the hard IRQ below must not allocate
+_uart_readinto = uart.readinto
 
-def read_frame():
-    # Sync hunt
+# ----- UART RX IRQ -----
+# The rp2 driver already moves RX bytes into its RXBUF-sized buffer from a
+# hardware IRQ, so nothing is lost while the main loop blocks in print() as
+# long as it catches up within RXBUF bytes. On top of that, a hard RXIDLE IRQ
+# (runs even during a blocking print) copies bytes into our ring and stamps
+# sync bytes, so frame times don't depend on main-loop latency. Falls back to
+# polling the driver buffer on firmware without UART.irq.
+RING_SIZE = 512                 # power of two
+_RING_MASK = RING_SIZE - 1
+_ring = bytearray(RING_SIZE)
+_ring_us = array.array('I', bytes(4 * RING_SIZE))   # ticks_us, stored at sync bytes
+_scratch = bytearray(32)
+_w = 0                          # written by IRQ only
+_r = 0                          # written by main loop only
+_keep = 0                       # oldest ring slot the main loop still needs
+_overrun = False                # set by IRQ when the ring fills; main loop resyncs
+frame_us = 0                    # RX timestamp of the last frame returned
+
+def _on_rx(u):
+    # Hard IRQ (must not allocate). Each sync byte is stamped with the time
+    # this IRQ ran: RXIDLE fires once the line goes idle, i.e. shortly after
+    # the burst holding that frame ended, independent of the main loop.
+    global _w, _overrun
+    now = time.ticks_us()
+    w = _w
+    stop = (_keep - 1) & _RING_MASK   # writing here would lap the reader
+    ring = _ring
+    ring_us = _ring_us
+    scratch = _scratch
+    size = len(scratch)
+    any_ = _uart_any
+    readinto = _uart_readinto
     while True:
-        b = uart.read(1)
-        if not b:
-            return None
-        if b[0] == CRSF_SYNC:
+        n = any_()
+        if not n:
             break
+        # Ask only for what's buffered so readinto never waits on timeout
+        n = readinto(scratch, n if n < size else size)
+        if not n:
+            break
+        if _overrun:
+            continue        # ring full: drop until the main loop resyncs
+        for i in range(n):
+            if w == stop:
+                _overrun = True
+                break
+            b = scratch[i]
+            ring[w] = b
+            if b == CRSF_SYNC:
+                ring_us[w] = now
+            w = (w + 1) & _RING_MASK
+    _w = w
 
-    # Length
-    lb = uart.read(1)
-    if not lb:
-        return None
-    length = lb[0]  # type + payload + crc
-    if length < 2 or length > (MAX_FRAME - 2):
-        return None
+USE_IRQ = hasattr(uart, "irq") and hasattr(UART, "IRQ_RXIDLE")
+if USE_IRQ:
+    uart.irq(_on_rx, UART.IRQ_RXIDLE, hard=True)
 
-    rest = uart.read(length)
-    if not rest or len(rest) != length:
-        return None
+# Preallocated receive buffer: bytes drained from the UART but not yet
+# consumed as a frame live in _rxbuf[_rxpos:_rxlen]. Frame bytes are never
+# copied out (no per-frame copies), though the memoryview slices and result
+# tuple are still small heap objects. The payload handed back is a view into
+# this buffer, valid until the next read_frame() call.
+RX_BUF_SIZE = 4 * MAX_FRAME
+_rxbuf = bytearray(RX_BUF_SIZE)
+_rxmv = memoryview(_rxbuf)
+_ringmv = memoryview(_ring)
+_rxlen = 0
+_rxpos = 0
 
-    frame_type = rest[0]
-    payload = rest[1:-1]
-    crc = rest[-1]
+def _compact():
+    # Shift unconsumed bytes to the front (in-place memmove).
+    # _rxbuf[i] always came from ring slot (_keep + i) & _RING_MASK.
+    global _rxlen, _rxpos, _keep
+    if _rxpos:
+        _keep = (_keep + _rxpos) & _RING_MASK
+        n = _rxlen - _rxpos
+        if n:
+            _rxmv[0:n] = _rxmv[_rxpos:_rxlen]
+        _rxlen = n
+        _rxpos = 0
 
-    # CRC over [type + payload]
-    if crc8_d5(bytes([frame_type]) + payload) != crc:
-        return None
+def _drain():
+    global _rxlen, _rxpos, _r, _keep, _overrun
+    if _overrun:
+        # Bytes were lost: drop everything buffered and resync on new data
+        _rxlen = 0
+        _rxpos = 0
+        _r = _w
+        _keep = _r
+        _overrun = False
+        if _crsf is not None:
+            _crsf.reset()   # drop the C side's pre-gap partial frame
+    room = RX_BUF_SIZE - _rxlen
+    if USE_IRQ:
+        w = _w
+        r = _r
+        while r != w and room:
+            # Contiguous run up to the writer or the end of the ring
+            n = (w if w > r else RING_SIZE) - r
+            if n > room:
+                n = room
+            _rxmv[_rxlen:_rxlen + n] = _ringmv[r:r + n]
+            _rxlen += n
+            room -= n
+            r = (r + n) & _RING_MASK
+        _r = r
+    else:
+        # Bulk drain whatever the UART FIFO holds in one call
+        n = uart.any()
+        if n > room:
+            n = room
+        if n:
+            n = uart.readinto(_rxmv[_rxlen:], n)
+            if n:
+                _rxlen += n
 
-    return (frame_type, payload)
+# MicroPython's bytearray has no find(); scan for the sync byte natively
+@micropython.viper
+def _find_sync(buf, start: int, end: int) -> int:
+    p = ptr8(buf)
+    i = start
+    while i < end:
+        if p[i] == 0xC8:    # CRSF_SYNC
+            return i
+        i += 1
+    return -1
+
+# Parser as a native-compiled generator: scan position and the hot names live
+# in its locals across yields, so each resume picks up mid-buffer instead of
+# re-entering a function and starting over. Yields (frame_type, payload) per
+# valid frame, or None once the buffered bytes are used up.
+@micropython.native
+def _frame_parser():
+    global _rxpos, frame_us
+    buf = _rxbuf
+    mv = _rxmv
+    tbl = _CRC_TBL
+    ring_us = _ring_us
+    mask = _RING_MASK
+    max_len = MAX_FRAME - 2
+    while True:
+        _compact()
+        _drain()
+        end = _rxlen
+        pos = 0
+        while True:
+            # Sync hunt
+            pos = _find_sync(buf, pos, end)
+            if pos < 0:
+                pos = end
+                break
+
+            # Length
+            if end - pos < 2:
+                break
+            length = buf[pos + 1]  # type + payload + crc
+            if length < 2 or length > max_len:
+                pos += 1   # bogus sync byte, resync
+                continue
+
+            if end - pos < 2 + length:
+                break      # partial frame, keep bytes for next pass
+
+            frame_type = buf[pos + 2]
+            payload = mv[pos + 3:pos + 1 + length]
+
+            # CRC over [type + payload] (seed with type to avoid a concat copy)
+            if crc8_d5(payload, tbl[frame_type]) != buf[pos + 1 + length]:
+                pos += 1   # drop only the sync byte, resync in place
+                continue
+
+            frame_us = ring_us[(_keep + pos) & mask] if USE_IRQ else time.ticks_us()
+            pos += 2 + length
+            _rxpos = pos
+            yield (frame_type, payload)
+        _rxpos = pos
+        yield None
+
+_frames = _frame_parser()
+
+def read_frame():
+    # Payload is a view into the receive buffer, valid until the next call
+    return next(_frames)
+
+def read_channels():
+    """Return the 16 channel ticks of the next RC frame, or None."""
+    global _rxlen, _keep, frame_us
+    if _crsf is not None:
+        # Native path: hand all drained bytes to the C decoder in one call
+        _drain()
+        n = _rxlen
+        if not n:
+            return None
+        ch = _crsf.feed(_rxmv[:n], _channels)
+        if ch is not None:
+            if USE_IRQ:
+                # _rxbuf[0] came from ring slot _r - n; the C side reports
+                # where the returned frame's sync byte was relative to it
+                # (negative if it arrived in an earlier drain)
+                frame_us = _ring_us[(_r - n + _crsf.sync_offset()) & _RING_MASK]
+            else:
+                frame_us = time.ticks_us()
+        _rxlen = 0
+        # Keep the ring slots of the partial frame the C side still holds
+        _keep = (_r - _crsf.pending()) & _RING_MASK
+        return ch
+
+    f = next(_frames)
+    if not f:
+        return None
+    ftype, pl = f
+    if ftype == TYPE_RC_CHANNELS and len(pl) == 22:
+        return unpack_16ch_11bit(pl)
+    return None
 
 print("CRSF reader starting at {} baud...".format(BAUD))
 
-last_print = time.ticks_ms()
+# Bind hot-loop callables once (saves attribute lookups per iteration)
+ticks_ms = time.ticks_ms
+ticks_diff = time.ticks_diff
+
+last_print = ticks_ms()
 
 while True:
-    f = read_frame()
-    if not f:
+    ch_ticks = read_channels()
+    if ch_ticks is None:
         continue
 
-    ftype, pl = f
+    # Normalize CH1..CH4 for quick viewing
+    roll  = ticks_to_unit(ch_ticks[0])   # CH1
+    pitch = ticks_to_unit(ch_ticks[1])   # CH2
+    yaw   = ticks_to_unit(ch_ticks[2])   # CH3
+    thr   = ticks_to_unit(ch_ticks[3])   # CH4
 
-    if ftype == TYPE_RC_CHANNELS and len(pl) == 22:
-        ch_ticks = unpack_16ch_11bit(pl)
-        # Normalize CH1..CH4 for quick viewing
-        roll  = ticks_to_unit(ch_ticks[0])   # CH1
-        pitch = ticks_to_unit(ch_ticks[1])   # CH2
-        yaw   = ticks_to_unit(ch_ticks[2])   # CH3
-        thr   = ticks_to_unit(ch_ticks[3])   # CH4
-
-        # Print at ~20 Hz
-        now = time.ticks_ms()
-        if time.ticks_diff(now, last_print) > 50:
-            print("CH1..4 (unit):", round(roll,3), round(pitch,3), round(yaw,3), round(thr,3),
-                  "| RAW ticks:", ch_ticks[:8])
-            last_print = now
+    # Print at ~20 Hz
+    now = ticks_ms()
+    if ticks_diff(now, last_print) > 50:
+        # Format in one pass; index channels directly (no slice copy)
+        c = ch_ticks
+        print("CH1..4 (unit): %.3f %.3f %.3f %.3f | RAW ticks: %d %d %d %d %d %d %d %d" %
+              (roll, pitch, yaw, thr, c[0], c[1], c[2], c[3], c[4], c[5], c[6], c[7]))
+        last_print = now
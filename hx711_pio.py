@@ -0,0 +1,87 @@
+# hx711_pio.py  —  MicroPython on Raspberry Pi Pico (RP2040)
+# HX711 reader that shifts bits in with a PIO state machine instead of
+# bit-banging GPIO from Python. Drop-in for the hx711.HX711 calls used here.
+
+import array
+import rp2
+import time
+
+# PD_SCK pulses after the 24 data bits select the next conversion's channel/gain
+GAIN_PULSES = {128: 1, 64: 3, 32: 2}
+
+# 6 PIO cycles per bit -> ~1 MHz PD_SCK at 6 MHz (HX711 PD_SCK high/low >= 0.2 µs)
+PIO_FREQ = 6_000_000
+
+# A sample arrives every ~100 ms at 10 SPS; give up well after that
+# (a miswired/unpowered HX711 holds DOUT high and never converts)
+TIMEOUT_MS = 500
+
+# set pin = PD_SCK, in pin = DOUT. Y holds (extra gain pulses - 1), set at init.
+@rp2.asm_pio(set_init=rp2.PIO.OUT_LOW, in_shiftdir=rp2.PIO.SHIFT_LEFT,
+             fifo_join=rp2.PIO.JOIN_RX)
+def _hx711_prog():
+    wrap_target()
+    set(x, 23)
+    wait(0, pin, 0)             # DOUT low = conversion ready
+    label("bit")
+    set(pins, 1)    [1]
+    in_(pins, 1)
+    set(pins, 0)    [1]
+    jmp(x_dec, "bit")
+    push(noblock)               # drop samples nobody is reading; never stall
+    mov(x, y)
+    label("gain")
+    set(pins, 1)    [1]
+    set(pins, 0)    [1]
+    jmp(x_dec, "gain")
+    wrap()
+
+class PIOHX711:
+    def __init__(self, clk, dt, gain=128, sm_id=0):
+        if gain not in GAIN_PULSES:
+            raise ValueError("gain must be 128, 64 or 32")
+        self.OFFSET = 0
+        self.sm = rp2.StateMachine(sm_id, _hx711_prog, freq=PIO_FREQ,
+                                   set_base=clk, in_base=dt)
+        # JOIN_RX leaves no TX FIFO, so load Y with an immediate (<= 2 fits)
+        self.sm.exec("set(y, %d)" % (GAIN_PULSES[gain] - 1))
+        self.sm.active(1)
+
+    def any(self):
+        # Samples already queued in the RX FIFO (get() won't block for these)
+        return self.sm.rx_fifo()
+
+    def get(self):
+        # Next sample from the FIFO, oldest first; waits up to TIMEOUT_MS
+        if not self.sm.rx_fifo():
+            deadline = time.ticks_add(time.ticks_ms(), TIMEOUT_MS)
+            while not self.sm.rx_fifo():
+                if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
+                    raise OSError("HX711 not responding")
+        v = self.sm.get()
+        if v & 0x800000:        # sign-extend 24 -> 32 bit
+            v -= 0x1000000
+        return v
+
+    def _flush(self):
+        # Discard samples that queued up while nobody was reading
+        while self.sm.rx_fifo():
+            self.sm.get()
+
+    def read(self):
+        self._flush()
+        return self.get()
+
+    def read_average(self, times=3):
+        # PIO paces itself at the HX711 output rate; no delay needed
+        self._flush()
+        buf = array.array('i', bytes(4 * times))
+        for i in range(times):
+            buf[i] = self.get()
+        return sum(buf) // times
+
+    def tare(self, times=15):
+        self.OFFSET = self.read_average(times)
+
+    def deinit(self):
+        self.sm.active(0)
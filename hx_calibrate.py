@@ -2,7 +2,8 @@ from machine import Pin
 
 from time import sleep
 import ujson, os
-import hx711
+import select, sys
+from hx711_pio import PIOHX711
 
 # ---------- User wiring (Pico GPIO) ----------
 CLK_PIN = 5   # GP5 -> HX711 CLK
@@ -17,15 +18,39 @@ CAL_FORCE_N   = CAL_WEIGHT_LB * LBF_TO_NEWTON  # ≈ 22.2411 N
 
 # ---------- File to store calibration ----------
 CAL_FILE = "hx_cal.json"
+# Same constants as Python literals, imported directly by hx_read_newtons
+CAL_CONSTS_FILE = "cal_consts.py"
 
 # ---------- Helpers ----------
+_last_char = ""   # kept across prompts so a trailing "\n" of "\r\n" is skipped
+
 def wait_for_enter(msg="Press ENTER to continue..."):
+    # Poll stdin instead of blocking in input(); the PIO sampler keeps the
+    # HX711 converting meanwhile. Serial terminals may send '\r', '\n' or
+    # "\r\n" for Enter, so accept either and echo what is typed.
     print(msg)
+    poll = select.poll()
+    poll.register(sys.stdin, select.POLLIN)
+    global _last_char
+    typed = False
     while True:
-        s = input().strip()
-        if s == "":
-            return   # continue when Enter is pressed
-        print("Please just press ENTER.")
+        if not poll.poll(10):
+            continue
+        c = sys.stdin.read(1)
+        if c == "\n" and _last_char == "\r":
+            _last_char = ""   # second half of "\r\n"
+            continue
+        _last_char = c
+        if c == "\r" or c == "\n":
+            sys.stdout.write("\n")
+            if not typed:
+                return   # continue when Enter is pressed
+            typed = False
+            print("Please just press ENTER.")
+        else:
+            sys.stdout.write(c)
+            if c.strip():
+                typed = True
 
 def safe_remove(path):
     try:
@@ -47,11 +72,12 @@ def main():
 
     # Remove any previous calibration
     safe_remove(CAL_FILE)
+    safe_remove(CAL_CONSTS_FILE)
 
     # Init HX711
     clk = Pin(CLK_PIN, Pin.OUT)
     dt  = Pin(DT_PIN,  Pin.IN)
-    hx  = hx711.HX711(clk, dt, gain=GAIN)
+    hx  = PIOHX711(clk, dt, gain=GAIN)
 
     print("Letting amplifier settle...")
     sleep(1.0)
@@ -94,7 +120,14 @@ def main():
     with open(CAL_FILE, "w") as f:
         ujson.dump(cal, f)
 
-    print(f"\nSaved new calibration to {CAL_FILE}")
+    # Precompute 1/CPN so the reader multiplies instead of dividing
+    with open(CAL_CONSTS_FILE, "w") as f:
+        f.write("# Generated by hx_calibrate.py -- do not edit\n")
+        f.write("CPN = {}\n".format(repr(counts_per_newton)))
+        f.write("ZERO = {}\n".format(repr(raw_zero)))
+        f.write("INV_CPN = {}\n".format(repr(1.0 / counts_per_newton)))
+
+    print(f"\nSaved new calibration to {CAL_FILE} and {CAL_CONSTS_FILE}")
     print("You can now use this file in your main reader to report Newtons directly.\n")
 
 if __name__ == "__main__":
@@ -1,21 +1,47 @@
-from machine import Pin
+from machine import Pin, Timer
 from time import sleep
-import ujson, hx711
+import array
+from hx711_pio import PIOHX711
+from cal_consts import ZERO, INV_CPN   # written by hx_calibrate.py; INV_CPN = 1 / counts_per_newton
 
 CLK_PIN, DT_PIN = 5, 4
-hx = hx711.HX711(Pin(CLK_PIN, Pin.OUT), Pin(DT_PIN, Pin.IN), gain=128)
+hx = PIOHX711(Pin(CLK_PIN, Pin.OUT), Pin(DT_PIN, Pin.IN), gain=128)
 
-with open("hx_cal.json") as f:
-    cal = ujson.load(f)
+# Rolling trimmed mean: drop the TRIM lowest/highest of the last SAMPLES
+# readings to reject impulsive glitches, average the rest.
+SAMPLES = 16
+TRIM    = 2
+KEPT    = SAMPLES - 2 * TRIM
 
-CPN = cal["counts_per_newton"]      # counts per Newton
-ZERO = cal["raw_zero"]
+# Fold the 1/KEPT of the mean into the scale so each update is one multiply
+_ZERO_SUM = ZERO * KEPT
+_SCALE    = INV_CPN / KEPT
 
-def read_newtons(samples=10):
-    counts = hx.read_average(samples)
-    return (counts - ZERO) / CPN    # N = (counts - zero) / (counts_per_newton)
+SAMPLE_MS = 100    # HX711 runs at 10 SPS; sampling is decoupled from printing
+
+_win = array.array('i', [0] * SAMPLES)
+for i in range(SAMPLES):
+    _win[i] = hx.read()
+_wi = 0
+
+def _on_sample(_t):
+    # Timer callback: move whatever the PIO FIFO has queued into the window.
+    # Never blocks; each array element store is a single machine word.
+    global _wi
+    while hx.any():
+        _win[_wi] = hx.get()
+        _wi = (_wi + 1) % SAMPLES
+
+def read_newtons():
+    # sorted() snapshots the window in one call, so a concurrent timer
+    # update can't tear the values we average
+    total = sum(sorted(_win)[TRIM:SAMPLES - TRIM])
+    return (total - _ZERO_SUM) * _SCALE    # N = (mean - zero) / (counts_per_newton)
+
+sampler = Timer()
+sampler.init(period=SAMPLE_MS, mode=Timer.PERIODIC, callback=_on_sample)
 
 while True:
-    F = read_newtons(20)
+    F = read_newtons()
     print("{:.3f} N".format(F))
-    sleep(0.3)
\ No newline at end of file
+    sleep(0.3)    # display rate only
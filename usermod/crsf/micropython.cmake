@@ -0,0 +1,12 @@
+# CMake build (rp2, esp32): make USER_C_MODULES=/path/to/usermod/crsf/micropython.cmake
+add_library(usermod_crsf INTERFACE)
+
+target_sources(usermod_crsf INTERFACE
+    ${CMAKE_CURRENT_LIST_DIR}/modcrsf.c
+)
+
+target_include_directories(usermod_crsf INTERFACE
+    ${CMAKE_CURRENT_LIST_DIR}
+)
+
+target_link_libraries(usermod INTERFACE usermod_crsf)
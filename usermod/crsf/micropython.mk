@@ -0,0 +1,5 @@
+# Make build (other ports): make USER_C_MODULES=/path/to/usermod
+CRSF_MOD_DIR := $(USERMOD_DIR)
+
+SRC_USERMOD += $(CRSF_MOD_DIR)/modcrsf.c
+CFLAGS_USERMOD += -I$(CRSF_MOD_DIR)
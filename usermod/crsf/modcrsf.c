@@ -0,0 +1,202 @@
+// modcrsf.c  —  MicroPython user C module: native CRSF decoder
+// Frame sync + tabled CRC8 (poly 0xD5) + 11-bit channel unpack in one call.
+//
+//   import crsf
+//   ch = crsf.feed(buf)        # -> 16-tuple of channel ticks, or None
+//   ch = crsf.feed(buf, out)   # fill out (array('H', 16)), return it or None
+//   crsf.sync_offset()         # offset in the last buf of the returned frame's
+//                              #   sync byte (< 0: it arrived in an earlier buf)
+//   crsf.pending()             # bytes held back waiting for the rest of a frame
+//   crsf.reset()               # drop held bytes (e.g. after an RX overrun)
+//
+// Bytes are buffered across calls, so buf can be any chunk size. When a
+// chunk completes more than one RC_CHANNELS frame, the latest one wins.
+// Parsing/resync matches crsf_reader.read_frame(): on a bad length or CRC
+// only the sync byte is dropped and the search resumes right after it.
+//
+// Build into the firmware, e.g. for rp2:
+//   make USER_C_MODULES=/path/to/usermod/crsf/micropython.cmake
+
+#include <string.h>
+
+#include "py/runtime.h"
+#include "py/obj.h"
+
+#define CRSF_SYNC             0xC8
+#define CRSF_TYPE_RC_CHANNELS 0x16
+#define CRSF_MAX_FRAME        64
+#define CRSF_RC_LEN           24   // type + 22 payload + crc
+#define CRSF_RX_BUF           (4 * CRSF_MAX_FRAME)
+#define CRSF_NUM_CH           16
+
+static uint8_t crc_tbl[256];
+static bool crc_tbl_ready;
+
+static uint8_t rxbuf[CRSF_RX_BUF];
+static size_t rxlen;
+
+// Running byte count of everything fed, to locate frames across calls
+static uint32_t stream_pos;     // stream offset of rxbuf[0]
+static uint32_t rc_sync_pos;    // stream offset of the latest RC frame's sync byte
+static int32_t rc_sync_offset;  // rc_sync_pos relative to the last feed()'s buf
+
+static void crc_tbl_init(void) {
+    for (int i = 0; i < 256; i++) {
+        uint8_t crc = (uint8_t)i;
+        for (int b = 0; b < 8; b++) {
+            crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0xD5) : (uint8_t)(crc << 1);
+        }
+        crc_tbl[i] = crc;
+    }
+    crc_tbl_ready = true;
+}
+
+static uint8_t crc8_d5(const uint8_t *p, size_t n) {
+    uint8_t crc = 0;
+    while (n--) {
+        crc = crc_tbl[crc ^ *p++];
+    }
+    return crc;
+}
+
+// 8 channels from 11 bytes, LSB-first, straight-line shifts
+static void unpack_8ch(const uint8_t *p, uint16_t *ch) {
+    ch[0] = (uint16_t)((p[0]       | p[1]  << 8)               & 0x7FF);
+    ch[1] = (uint16_t)((p[1]  >> 3 | p[2]  << 5)               & 0x7FF);
+    ch[2] = (uint16_t)((p[2]  >> 6 | p[3]  << 2 | p[4]  << 10) & 0x7FF);
+    ch[3] = (uint16_t)((p[4]  >> 1 | p[5]  << 7)               & 0x7FF);
+    ch[4] = (uint16_t)((p[5]  >> 4 | p[6]  << 4)               & 0x7FF);
+    ch[5] = (uint16_t)((p[6]  >> 7 | p[7]  << 1 | p[8]  << 9)  & 0x7FF);
+    ch[6] = (uint16_t)((p[8]  >> 2 | p[9]  << 6)               & 0x7FF);
+    ch[7] = (uint16_t)((p[9]  >> 5 | p[10] << 3)               & 0x7FF);
+}
+
+// Parse every complete frame in rxbuf; keep the unconsumed tail.
+// Returns true if at least one valid RC_CHANNELS frame was unpacked into ch.
+static bool parse(uint16_t *ch) {
+    bool got = false;
+    size_t pos = 0;
+    while (pos < rxlen) {
+        // Sync hunt
+        const uint8_t *s = memchr(rxbuf + pos, CRSF_SYNC, rxlen - pos);
+        if (s == NULL) {
+            pos = rxlen;
+            break;
+        }
+        pos = (size_t)(s - rxbuf);
+
+        // Length (type + payload + crc)
+        if (rxlen - pos < 2) {
+            break;
+        }
+        size_t length = rxbuf[pos + 1];
+        if (length < 2 || length > CRSF_MAX_FRAME - 2) {
+            pos += 1;   // bogus sync byte, resync
+            continue;
+        }
+        if (rxlen - pos < 2 + length) {
+            break;      // partial frame, keep bytes for next call
+        }
+
+        const uint8_t *body = rxbuf + pos + 2;
+        if (crc8_d5(body, length - 1) != body[length - 1]) {
+            pos += 1;   // drop only the sync byte, resync in place
+            continue;
+        }
+
+        if (body[0] == CRSF_TYPE_RC_CHANNELS && length == CRSF_RC_LEN) {
+            unpack_8ch(body + 1, ch);
+            unpack_8ch(body + 12, ch + 8);
+            rc_sync_pos = stream_pos + (uint32_t)pos;
+            got = true;
+        }
+        pos += 2 + length;
+    }
+
+    // Shift the unconsumed tail to the front
+    stream_pos += (uint32_t)pos;
+    rxlen -= pos;
+    memmove(rxbuf, rxbuf + pos, rxlen);
+    return got;
+}
+
+static mp_obj_t crsf_feed(size_t n_args, const mp_obj_t *args) {
+    if (!crc_tbl_ready) {
+        crc_tbl_init();
+    }
+
+    mp_buffer_info_t in;
+    mp_get_buffer_raise(args[0], &in, MP_BUFFER_READ);
+    const uint8_t *src = in.buf;
+    size_t left = in.len;
+    uint32_t in_start = stream_pos + (uint32_t)rxlen;
+
+    uint16_t ch[CRSF_NUM_CH];
+    bool got = false;
+    while (left) {
+        size_t n = CRSF_RX_BUF - rxlen;
+        if (n > left) {
+            n = left;
+        }
+        memcpy(rxbuf + rxlen, src, n);
+        rxlen += n;
+        src += n;
+        left -= n;
+        got |= parse(ch);
+    }
+
+    if (!got) {
+        return mp_const_none;
+    }
+    rc_sync_offset = (int32_t)(rc_sync_pos - in_start);
+
+    if (n_args > 1) {
+        mp_buffer_info_t out;
+        mp_get_buffer_raise(args[1], &out, MP_BUFFER_WRITE);
+        if (out.len < sizeof(ch)) {
+            mp_raise_ValueError(MP_ERROR_TEXT("out must hold 16 uint16"));
+        }
+        memcpy(out.buf, ch, sizeof(ch));
+        return args[1];
+    }
+
+    mp_obj_t items[CRSF_NUM_CH];
+    for (int i = 0; i < CRSF_NUM_CH; i++) {
+        items[i] = MP_OBJ_NEW_SMALL_INT(ch[i]);
+    }
+    return mp_obj_new_tuple(CRSF_NUM_CH, items);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(crsf_feed_obj, 1, 2, crsf_feed);
+
+static mp_obj_t crsf_sync_offset(void) {
+    return MP_OBJ_NEW_SMALL_INT(rc_sync_offset);
+}
+static MP_DEFINE_CONST_FUN_OBJ_0(crsf_sync_offset_obj, crsf_sync_offset);
+
+static mp_obj_t crsf_pending(void) {
+    return MP_OBJ_NEW_SMALL_INT(rxlen);
+}
+static MP_DEFINE_CONST_FUN_OBJ_0(crsf_pending_obj, crsf_pending);
+
+static mp_obj_t crsf_reset(void) {
+    stream_pos += (uint32_t)rxlen;
+    rxlen = 0;
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_0(crsf_reset_obj, crsf_reset);
+
+static const mp_rom_map_elem_t crsf_module_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_crsf) },
+    { MP_ROM_QSTR(MP_QSTR_feed), MP_ROM_PTR(&crsf_feed_obj) },
+    { MP_ROM_QSTR(MP_QSTR_sync_offset), MP_ROM_PTR(&crsf_sync_offset_obj) },
+    { MP_ROM_QSTR(MP_QSTR_pending), MP_ROM_PTR(&crsf_pending_obj) },
+    { MP_ROM_QSTR(MP_QSTR_reset), MP_ROM_PTR(&crsf_reset_obj) },
+};
+static MP_DEFINE_CONST_DICT(crsf_module_globals, crsf_module_globals_table);
+
+const mp_obj_module_t crsf_user_cmodule = {
+    .base = { &mp_type_module },
+    .globals = (mp_obj_dict_t *)&crsf_module_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_crsf, crsf_user_cmodule);